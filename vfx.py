@@ -1,13 +1,16 @@
 import os
-import subprocess
+import re
 import argparse
 import sys
+import shutil
+import functools
+import concurrent.futures
 
 def print_help():
     help_text = """
     Simple video frame extraction Python tool v 1.0.
     Syntax: 
-    vfx [-R] [-S] [-I] [-N x] [-T x] [-X x] [-Y x] [-P] [-D] [-H] [source_file | source_path]
+    vfx [-R] [-S] [-I] [-N x] [-T x] [-X x] [-Y x] [-A] [-C] [-G] [-J x] [-M] [-P] [-D] [-H] [--batch] [source_file | source_path]
     -R (recursive): All files in the current or specified directory and subdirectories are processed.
     -S (silent mode): No text output shown.
     -I (info): Only progress is shown, no diagnostic messages from ffmpeg.
@@ -15,133 +18,640 @@ def print_help():
     -T x (time): For each x seconds, a frame is extracted. If ‘0’ is specified all frames are extracted.
     -X x (width): Set the desired width in pixels of the extracted images. If -Y is not also used, the height is set automatically to maintain aspect ratio.
     -Y x (height): Set the desired height in pixels of the extracted images. If -X is not also used, the height is set automatically to maintain aspect ratio.
+    -A (async): Run the concurrent ffmpeg processes from one asyncio event loop instead of a pool of worker processes. Uses less memory; -J still sets the concurrency.
+    -C (concat): Process all found videos in one ffmpeg session via the concat demuxer, then sort the frames into the per-video folders. Works best when the videos share codec and resolution.
+    -G (gpu): Decode and scale on the GPU when ffmpeg reports a supported hardware accelerator (cuda or vaapi). Not used in -M pipe mode.
+    -J x (jobs): Process up to x video files in parallel. Default is the number of CPU cores.
+    -M (memory pipe): Receive frames from ffmpeg over a pipe and write the image files from Python, instead of letting ffmpeg write them to disk.
     -P (prompt): For each found video file answer y (yes), n (no) or (a) abort, to process the file or not, or to abort the process all together.
     -D (directory): All extracted files are saved together with the video file. Default is to create a new folder for the extracted frames.
     -H (help): Show this help text.
+    --batch: Read a newline separated list of video files from standard input and process them all in one go.
     """
     print(help_text)
 
+FFMPEG = 'ffmpeg'
+FFPROBE = 'ffprobe'
+
+# One C-speed match per file name, and unlike the old endswith tuple it
+# also accepts upper-case extensions such as .MP4.
+_VID_RE = re.compile(r'\.(mp4|mov|avi|mkv|m4v|webm)$', re.IGNORECASE)
+
+# How many inputs go into one batched ffmpeg invocation. Keeps command
+# lines manageable while still amortizing ffmpeg startup across files.
+BATCH_CHUNK = 32
+
 def check_ffmpeg():
-    try:
-        subprocess.run(['ffmpeg', '-version'], stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
-    except (subprocess.CalledProcessError, FileNotFoundError):
+    global FFMPEG, FFPROBE
+    ffmpeg_path = shutil.which('ffmpeg')
+    if ffmpeg_path is None:
         print("ffmpeg is required to run this script. Download ffmpeg from here: https://ffmpeg.org. See ffmpeg documentation for installation information")
         sys.exit(1)
+    # Remember the resolved paths so later spawns skip the PATH scan.
+    FFMPEG = ffmpeg_path
+    FFPROBE = shutil.which('ffprobe') or 'ffprobe'
 
-def extract_frames_fallback(video_file, output_dir, frame_count, silent, info, width, height):
-    base_name = os.path.splitext(os.path.basename(video_file))[0]
-    
+def _mp4_duration(video_file):
+    # Read the duration straight out of the container's mvhd box with a few
+    # small reads instead of spawning ffprobe. Returns None when the box
+    # cannot be found (e.g. fragmented or truncated files).
+    import struct
+    try:
+        with open(video_file, 'rb') as f:
+            file_size = os.fstat(f.fileno()).st_size
+
+            def find_box(wanted, end):
+                # Walk sibling boxes; on a hit the file is left at the box
+                # payload and the box end offset is returned.
+                while f.tell() + 8 <= end:
+                    start = f.tell()
+                    header = f.read(8)
+                    if len(header) < 8:
+                        return None
+                    size, box_type = struct.unpack('>I4s', header)
+                    if size == 1:
+                        size = struct.unpack('>Q', f.read(8))[0]
+                    elif size == 0:
+                        size = end - start
+                    if size < 8:
+                        return None
+                    if box_type == wanted:
+                        return start + size
+                    f.seek(start + size)
+                return None
+
+            moov_end = find_box(b'moov', file_size)
+            if moov_end is None:
+                return None
+            if find_box(b'mvhd', moov_end) is None:
+                return None
+            version = f.read(1)[0]
+            f.seek(3, 1)
+            if version == 1:
+                f.seek(16, 1)
+                timescale, duration = struct.unpack('>IQ', f.read(12))
+            else:
+                f.seek(8, 1)
+                timescale, duration = struct.unpack('>II', f.read(8))
+            if timescale == 0:
+                return None
+            return duration / timescale
+    except (OSError, struct.error, IndexError):
+        return None
+
+@functools.lru_cache(maxsize=None)
+def _probe_duration(video_file):
+    # MP4-family containers carry the duration in plain sight, so try the
+    # in-process reader first and only spawn ffprobe when that fails.
+    if video_file.lower().endswith(('.mp4', '.mov', '.m4v')):
+        duration = _mp4_duration(video_file)
+        if duration:
+            return duration
+    # subprocess is imported inside the extraction paths so invocations that
+    # never spawn anything (help text, argument errors) skip loading it.
+    import subprocess
+    # Cached so the duration of a file is probed at most once per run, even
+    # when extraction falls back and would otherwise probe again.
+    # -read_intervals keeps ffprobe from reading more than the first second.
+    result = subprocess.run([FFPROBE, '-v', 'error', '-select_streams', 'v:0', '-read_intervals', '1', '-show_entries', 'stream=duration', '-of', 'default=noprint_wrappers=1:nokey=1', video_file], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    try:
+        return float(result.stdout)
+    except ValueError:
+        # Matroska-family files (.mkv/.webm) report N/A per stream; their
+        # duration lives at the format level.
+        result = subprocess.run([FFPROBE, '-v', 'error', '-show_entries', 'format=duration', '-of', 'default=noprint_wrappers=1:nokey=1', video_file], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        try:
+            return float(result.stdout)
+        except ValueError:
+            raise ValueError(f"could not determine duration of {video_file}") from None
+
+@functools.lru_cache(maxsize=None)
+def _detect_hwaccel():
+    import subprocess
+    result = subprocess.run([FFMPEG, '-hide_banner', '-hwaccels'], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    available = result.stdout.decode(errors='replace').split()
+    for method in ('cuda', 'vaapi'):
+        if method in available:
+            return method
+    return ''
+
+def _hwaccel_input_args(hwaccel):
+    if hwaccel == 'cuda':
+        return ['-hwaccel', 'cuda', '-hwaccel_output_format', 'cuda']
+    elif hwaccel == 'vaapi':
+        return ['-hwaccel', 'vaapi', '-hwaccel_output_format', 'vaapi']
+    return []
+
+@functools.lru_cache(maxsize=None)
+def _hwaccel_scale_suffix(hwaccel, width, height):
+    # Scale on the GPU, then download the frames so the mjpeg encoder can
+    # read them from system memory.
+    if hwaccel == 'cuda':
+        return _scale_suffix(width, height).replace(',scale=', ',scale_cuda=') + ',hwdownload,format=nv12'
+    elif hwaccel == 'vaapi':
+        return _scale_suffix(width, height).replace(',scale=', ',scale_vaapi=') + ',hwdownload,format=nv12'
+    return _scale_suffix(width, height)
+
+@functools.lru_cache(maxsize=None)
+def _scale_suffix(width, height):
+    if width > 0 and height > 0:
+        return f",scale={width}:{height}"
+    elif width > 0:
+        return f",scale={width}:-1"
+    elif height > 0:
+        return f",scale=-1:{height}"
+    return ""
+
+@functools.lru_cache(maxsize=None)
+def _run_kwargs(silent, info):
+    # The -S/-I flags never change within a run, so the subprocess output
+    # redirections are built once and splatted into every run() call.
+    import subprocess
+    if silent:
+        return {'stdout': subprocess.DEVNULL, 'stderr': subprocess.DEVNULL}
+    elif info:
+        return {'stdout': subprocess.DEVNULL, 'stderr': subprocess.PIPE}
+    return {}
+
+def _scratch_dir():
+    # Frames are first written to fast scratch storage (VFX_TMP, defaulting
+    # to /dev/shm on Linux) and moved into place afterwards, so ffmpeg never
+    # stalls on the destination filesystem. Set VFX_TMP= (empty) to disable.
+    scratch = os.environ.get('VFX_TMP')
+    if scratch is None and sys.platform.startswith('linux') and os.path.isdir('/dev/shm'):
+        scratch = '/dev/shm'
+    return scratch or None
+
+def _move_outputs(work_dir, output_dir):
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
+    with os.scandir(work_dir) as entries:
+        for entry in entries:
+            target = os.path.join(output_dir, entry.name)
+            try:
+                # Cheap rename when the scratch dir is on the same
+                # filesystem as the destination.
+                os.replace(entry.path, target)
+            except OSError:
+                shutil.move(entry.path, target)
+
+def extract_frames_seek(video_file, output_dir, duration, frame_count, silent, info, width, height, threads, name_infix):
+    import subprocess
+    base_name = os.path.splitext(os.path.basename(video_file))[0]
 
-    result = subprocess.run(['ffprobe', '-v', 'error', '-select_streams', 'v:0', '-show_entries', 'stream=duration', '-of', 'default=noprint_wrappers=1:nokey=1', video_file], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    duration = float(result.stdout)
-    
     interval = duration / frame_count
-    
+
     for i in range(frame_count):
         timestamp = i * interval
-        output_file = os.path.join(output_dir, f"{base_name}_{i+1:03d}.jpg")
-        vf_args = f"select='gte(t\\,{timestamp})',setpts=PTS-STARTPTS"
-        if width > 0 and height > 0:
-            vf_args += f",scale={width}:{height}"
-        elif width > 0:
-            vf_args += f",scale={width}:-1"
-        elif height > 0:
-            vf_args += f",scale=-1:{height}"
-        
+        output_file = os.path.join(output_dir, f"{base_name}{name_infix}_{i+1:03d}.jpg")
+        # Seeking before -i uses ffmpeg's fast keyframe seek, so each frame
+        # costs the same no matter how far into the video it lies.
         ffmpeg_command = [
-            'ffmpeg',
+            FFMPEG,
+            '-threads', str(threads),
+            '-ss', str(timestamp),
             '-i', video_file,
-            '-vf', vf_args,
-            '-vframes', '1',
-            '-q:v', '2',
-            output_file
+            '-frames:v', '1',
+            '-q:v', '2'
         ]
-        if silent or info:
-            subprocess.run(ffmpeg_command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL if silent else subprocess.PIPE)
-        else:
-            subprocess.run(ffmpeg_command)
+        scale = _scale_suffix(width, height)
+        if scale:
+            ffmpeg_command += ['-vf', scale[1:]]
+        ffmpeg_command.append(output_file)
+        subprocess.run(ffmpeg_command, **_run_kwargs(silent, info))
 
-def extract_frames(video_file, output_dir, frame_count, time_interval, silent, info, width, height):
+def extract_frames_fallback(video_file, output_dir, frame_count, silent, info, width, height, threads, name_infix):
+    import subprocess
     base_name = os.path.splitext(os.path.basename(video_file))[0]
     
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
-    
+
+    duration = _probe_duration(video_file)
+
+    interval = duration / frame_count
+    timestamps = [i * interval for i in range(frame_count)]
+
+    # Select all requested timestamps in a single pass so ffmpeg is spawned
+    # once instead of once per frame. Each term fires on the frame that
+    # crosses its timestamp (t at or past it, predecessor still before it),
+    # so a timestamp with no frame of its own cannot stall the later ones.
+    select_expr = '+'.join(f"gte(t\\,{timestamp})*(isnan(prev_t)+lt(prev_t\\,{timestamp}))" for timestamp in timestamps)
+    vf_args = f"select='{select_expr}',setpts=N/FRAME_RATE/TB" + _scale_suffix(width, height)
+
+    output_pattern = os.path.join(output_dir, base_name + name_infix + '_%03d.jpg')
+    ffmpeg_command = [
+        FFMPEG,
+        '-threads', str(threads),
+        '-i', video_file,
+        '-vf', vf_args,
+        '-vsync', 'vfr',
+        '-q:v', '2',
+        output_pattern
+    ]
     try:
-        vf_args = ""
-        if time_interval > 0:
-            vf_args = f'fps=1/{time_interval}'
+        subprocess.run(ffmpeg_command, check=True, **_run_kwargs(silent, info))
+        if not os.path.exists(os.path.join(output_dir, f"{base_name}{name_infix}_{frame_count:03d}.jpg")):
+            # Timestamps past the last frame (overestimated duration, -N
+            # beyond the clip's frame count) leave a shortfall; fill the
+            # full set in one frame at a time.
+            if not silent and not info:
+                print(f"Batched fallback produced too few frames for {video_file}. Extracting frames one at a time.")
+            extract_frames_seek(video_file, output_dir, duration, frame_count, silent, info, width, height, threads, name_infix)
+    except subprocess.CalledProcessError:
+        if not silent and not info:
+            print(f"Batched fallback failed for {video_file}. Extracting frames one at a time.")
+        extract_frames_seek(video_file, output_dir, duration, frame_count, silent, info, width, height, threads, name_infix)
+
+def _build_extract_command(video_file, output_dir, frame_count, time_interval, sizes, threads, hwaccel):
+    base_name = os.path.splitext(os.path.basename(video_file))[0]
+
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+
+    if time_interval > 0:
+        fps_args = f'fps=1/{time_interval}'
+    else:
+        duration = _probe_duration(video_file)
+
+        interval = duration / frame_count
+        fps_args = f'fps=1/{interval}'
+
+    # One input mapped to every target size, so the video is decoded
+    # once no matter how many sizes are requested.
+    ffmpeg_command = [FFMPEG, '-threads', str(threads)] + _hwaccel_input_args(hwaccel) + ['-i', video_file]
+    for width, height in sizes:
+        if len(sizes) > 1:
+            output_pattern = os.path.join(output_dir, f"{base_name}_{width}x{height}_%03d.jpg")
         else:
-            result = subprocess.run(['ffprobe', '-v', 'error', '-select_streams', 'v:0', '-show_entries', 'stream=duration', '-of', 'default=noprint_wrappers=1:nokey=1', video_file], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            duration = float(result.stdout)
-            
-            interval = duration / frame_count
-            vf_args = f'fps=1/{interval}'
-        
-        if width > 0 and height > 0:
-            vf_args += f",scale={width}:{height}"
-        elif width > 0:
-            vf_args += f",scale={width}:-1"
-        elif height > 0:
-            vf_args += f",scale=-1:{height}"
-        
-        output_pattern = os.path.join(output_dir, base_name + '_%03d.jpg')
-        ffmpeg_command = [
-            'ffmpeg',
-            '-i', video_file,
-            '-vf', vf_args,
-            '-pix_fmt', 'yuv420p',
+            output_pattern = os.path.join(output_dir, base_name + '_%03d.jpg')
+        ffmpeg_command += [
+            '-map', '0:v',
+            '-vf', fps_args + _hwaccel_scale_suffix(hwaccel, width, height),
             '-q:v', '2',
             output_pattern
         ]
-        if silent:
-            subprocess.run(ffmpeg_command, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-        elif info:
-            subprocess.run(ffmpeg_command, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
-        else:
-            subprocess.run(ffmpeg_command, check=True)
+    return ffmpeg_command
+
+def extract_frames(video_file, output_dir, frame_count, time_interval, silent, info, sizes, threads, hwaccel):
+    import subprocess
+    scratch = _scratch_dir()
+    work_dir = output_dir
+    if scratch:
+        import tempfile
+        work_dir = tempfile.mkdtemp(dir=scratch)
+    try:
+        ffmpeg_command = _build_extract_command(video_file, work_dir, frame_count, time_interval, sizes, threads, hwaccel)
+        subprocess.run(ffmpeg_command, check=True, **_run_kwargs(silent, info))
+        if work_dir is not output_dir:
+            _move_outputs(work_dir, output_dir)
     except subprocess.CalledProcessError:
         if not silent and not info:
             print(f"Fast method failed for {video_file}. Falling back to slower method.")
-        extract_frames_fallback(video_file, output_dir, frame_count, silent, info, width, height)
+        for width, height in sizes:
+            name_infix = f"_{width}x{height}" if len(sizes) > 1 else ''
+            extract_frames_fallback(video_file, output_dir, frame_count, silent, info, width, height, threads, name_infix)
+    finally:
+        if work_dir is not output_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+async def extract_frames_async(video_file, output_dir, frame_count, time_interval, silent, info, sizes, threads, hwaccel):
+    import asyncio
+    scratch = _scratch_dir()
+    work_dir = output_dir
+    if scratch:
+        import tempfile
+        work_dir = await asyncio.to_thread(tempfile.mkdtemp, dir=scratch)
+    try:
+        # Building the command probes the file with blocking ffprobe, so it
+        # runs in a worker thread; one file's probe then overlaps another
+        # file's still-running ffmpeg.
+        ffmpeg_command = await asyncio.to_thread(_build_extract_command, video_file, work_dir, frame_count, time_interval, sizes, threads, hwaccel)
+        process = await asyncio.create_subprocess_exec(*ffmpeg_command, **_run_kwargs(silent, info))
+        await process.communicate()
+        if process.returncode != 0:
+            if not silent and not info:
+                print(f"Fast method failed for {video_file}. Falling back to slower method.")
+            for width, height in sizes:
+                name_infix = f"_{width}x{height}" if len(sizes) > 1 else ''
+                await asyncio.to_thread(extract_frames_fallback, video_file, output_dir, frame_count, silent, info, width, height, threads, name_infix)
+        elif work_dir is not output_dir:
+            await asyncio.to_thread(_move_outputs, work_dir, output_dir)
+    finally:
+        if work_dir is not output_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
 
-def process_folder(folder, recursive, silent, info, frame_count, time_interval, prompt, same_dir, width, height):
+def _write_frame(output_file, data):
+    with open(output_file, 'wb') as f:
+        f.write(data)
+
+def extract_frames_pipe(video_file, output_dir, frame_count, time_interval, silent, info, sizes, threads):
+    import subprocess
+    base_name = os.path.splitext(os.path.basename(video_file))[0]
+
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+
+    if time_interval > 0:
+        fps_args = f'fps=1/{time_interval}'
+    else:
+        duration = _probe_duration(video_file)
+        interval = duration / frame_count
+        fps_args = f'fps=1/{interval}'
+
+    width, height = sizes[0]
+    ffmpeg_command = [
+        FFMPEG,
+        '-threads', str(threads),
+        '-i', video_file,
+        '-vf', fps_args + _scale_suffix(width, height),
+        '-f', 'image2pipe',
+        '-vcodec', 'mjpeg',
+        '-q:v', '2',
+        '-'
+    ]
+    process = subprocess.Popen(ffmpeg_command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL if silent or info else None)
+
+    # Split the MJPEG stream on the JPEG start/end markers and hand each
+    # frame to a writer thread, so decoding and disk writes overlap and no
+    # frame makes a round-trip through a temporary file.
+    buffer = b''
+    frame_number = 0
+    futures = []
+    with concurrent.futures.ThreadPoolExecutor() as writers:
+        while True:
+            chunk = process.stdout.read(65536)
+            if not chunk:
+                break
+            buffer += chunk
+            while True:
+                start = buffer.find(b'\xff\xd8')
+                if start < 0:
+                    break
+                end = buffer.find(b'\xff\xd9', start + 2)
+                if end < 0:
+                    break
+                frame_number += 1
+                output_file = os.path.join(output_dir, f"{base_name}_{frame_number:03d}.jpg")
+                futures.append(writers.submit(_write_frame, output_file, buffer[start:end + 2]))
+                buffer = buffer[end + 2:]
+    for future in futures:
+        future.result()
+    if process.wait() != 0:
+        if not silent and not info:
+            print(f"Fast method failed for {video_file}. Falling back to slower method.")
+        extract_frames(video_file, output_dir, frame_count, time_interval, silent, info, sizes, threads, '')
+
+def extract_frames_batch(video_files, frame_count, time_interval, silent, info, sizes, threads, same_dir, hwaccel):
+    import subprocess
+    width, height = sizes[0]
+    for start in range(0, len(video_files), BATCH_CHUNK):
+        chunk = video_files[start:start + BATCH_CHUNK]
+        # One ffmpeg loads its codecs once and decodes every input in the
+        # chunk, with a filter chain and output pattern per input.
+        ffmpeg_command = [FFMPEG, '-threads', str(threads)]
+        filters = []
+        outputs = []
+        chunk_dirs = []
+        for index, video_file in enumerate(chunk):
+            if not silent and info:
+                print(f"Processing: {video_file}")
+            output_dir = _output_dir_for(video_file, same_dir)
+            if not os.path.exists(output_dir):
+                os.makedirs(output_dir)
+            chunk_dirs.append(output_dir)
+            base_name = os.path.splitext(os.path.basename(video_file))[0]
+            if time_interval > 0:
+                fps_args = f'fps=1/{time_interval}'
+            else:
+                interval = _probe_duration(video_file) / frame_count
+                fps_args = f'fps=1/{interval}'
+            ffmpeg_command += _hwaccel_input_args(hwaccel) + ['-i', video_file]
+            filters.append(f"[{index}:v]{fps_args}{_hwaccel_scale_suffix(hwaccel, width, height)}[o{index}]")
+            outputs += ['-map', f'[o{index}]', '-q:v', '2', os.path.join(output_dir, base_name + '_%03d.jpg')]
+        ffmpeg_command += ['-filter_complex', ';'.join(filters)] + outputs
+        try:
+            subprocess.run(ffmpeg_command, check=True, **_run_kwargs(silent, info))
+        except subprocess.CalledProcessError:
+            if not silent and not info:
+                print("Batched extraction failed. Processing the files one at a time.")
+            for video_file, output_dir in zip(chunk, chunk_dirs):
+                extract_frames(video_file, output_dir, frame_count, time_interval, silent, info, sizes, threads, hwaccel)
+
+def extract_frames_concat(video_files, frame_count, time_interval, silent, info, sizes, threads, same_dir, hwaccel):
+    import subprocess
+    import tempfile
+    if not video_files:
+        return
+    width, height = sizes[0]
+
+    # Lay every video out on one concatenated timeline and note how many
+    # frames each contributes; that table maps the global frame numbers
+    # back to per-video files afterwards.
+    entries = []
+    timestamps = []
+    offset = 0.0
+    for video_file in video_files:
+        if not silent and info:
+            print(f"Processing: {video_file}")
+        duration = _probe_duration(video_file)
+        if time_interval > 0:
+            count = max(1, int(duration / time_interval))
+            interval = time_interval
+        else:
+            count = frame_count
+            interval = duration / frame_count
+        timestamps.extend(offset + i * interval for i in range(count))
+        output_dir = _output_dir_for(video_file, same_dir)
+        if not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+        base_name = os.path.splitext(os.path.basename(video_file))[0]
+        entries.append((output_dir, base_name, count))
+        offset += duration
+
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as list_file:
+        for video_file in video_files:
+            escaped = os.path.abspath(video_file).replace("'", "'\\''")
+            list_file.write(f"file '{escaped}'\n")
+        list_path = list_file.name
+
+    # Each term fires on the frame crossing its timestamp (t at or past it,
+    # predecessor still before it), so a timestamp with no frame of its own
+    # cannot stall the later ones - the probed durations the offsets are
+    # built from routinely drift from the demuxer's actual splice points.
+    select_expr = '+'.join(f"gte(t\\,{timestamp})*(isnan(prev_t)+lt(prev_t\\,{timestamp}))" for timestamp in timestamps)
+    work_dir = tempfile.mkdtemp()
+    output_pattern = os.path.join(work_dir, 'frame_%06d.jpg')
+    ffmpeg_command = [
+        FFMPEG,
+        '-threads', str(threads)
+    ] + _hwaccel_input_args(hwaccel) + [
+        '-f', 'concat',
+        '-safe', '0',
+        '-i', list_path,
+        '-vf', f"select='{select_expr}',setpts=N/FRAME_RATE/TB" + _hwaccel_scale_suffix(hwaccel, width, height),
+        '-vsync', 'vfr',
+        '-q:v', '2',
+        output_pattern
+    ]
+    try:
+        subprocess.run(ffmpeg_command, check=True, **_run_kwargs(silent, info))
+        # A shortfall anywhere shifts the global numbering for every video
+        # after it, so the mapping is only trusted when the session yielded
+        # the full set; otherwise redo the whole set per file.
+        if len(os.listdir(work_dir)) != len(timestamps):
+            if not silent and not info:
+                print("Concatenated extraction produced too few frames. Processing the files one at a time.")
+            for video_file, (output_dir, base_name, count) in zip(video_files, entries):
+                extract_frames(video_file, output_dir, frame_count, time_interval, silent, info, sizes, threads, hwaccel)
+        else:
+            frame_number = 0
+            for output_dir, base_name, count in entries:
+                for i in range(count):
+                    frame_number += 1
+                    source = os.path.join(work_dir, f'frame_{frame_number:06d}.jpg')
+                    target = os.path.join(output_dir, f'{base_name}_{i+1:03d}.jpg')
+                    try:
+                        os.replace(source, target)
+                    except OSError:
+                        shutil.move(source, target)
+    except subprocess.CalledProcessError:
+        if not silent and not info:
+            print("Concatenated extraction failed. Processing the files one at a time.")
+        for video_file, (output_dir, base_name, count) in zip(video_files, entries):
+            extract_frames(video_file, output_dir, frame_count, time_interval, silent, info, sizes, threads, hwaccel)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        os.remove(list_path)
+
+async def _process_file_async(video_file, silent, info, frame_count, time_interval, same_dir, width, height, threads, hwaccel, semaphore):
+    import asyncio
+    async with semaphore:
+        if not silent and info:
+            print(f"Processing: {video_file}")
+        output_dir = await asyncio.to_thread(_output_dir_for, video_file, same_dir)
+        await extract_frames_async(video_file, output_dir, frame_count, time_interval, silent, info, [(width, height)], threads, hwaccel)
+
+async def process_folder_async(video_files, silent, info, frame_count, time_interval, same_dir, width, height, threads, jobs, hwaccel):
+    import asyncio
+    # One event loop drives every file in a single Python process, with the
+    # semaphore keeping at most `jobs` ffmpeg processes alive at once.
+    semaphore = asyncio.Semaphore(jobs)
+    await asyncio.gather(*(_process_file_async(video_file, silent, info, frame_count, time_interval, same_dir, width, height, threads, hwaccel, semaphore) for video_file in video_files))
+
+def _iter_video_files(folder, recursive):
+    # Yields matches as the directory is read, so dispatch can start before
+    # enumeration of a large tree finishes and no full listing is held in
+    # memory.
     if recursive:
         for root, _, files in os.walk(folder):
             for filename in files:
-                process_file(os.path.join(root, filename), silent, info, frame_count, time_interval, prompt, same_dir, width, height)
+                if _VID_RE.search(filename):
+                    yield os.path.join(root, filename)
     else:
-        for filename in os.listdir(folder):
-            process_file(os.path.join(folder, filename), silent, info, frame_count, time_interval, prompt, same_dir, width, height)
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if entry.is_file() and _VID_RE.search(entry.name):
+                    yield entry.path
 
-def process_file(video_file, silent, info, frame_count, time_interval, prompt, same_dir, width, height):
-    if video_file.endswith(('.mp4', '.mov', '.avi', '.mkv')):
-        if prompt:
+def process_folder(folder, recursive, silent, info, frame_count, time_interval, prompt, same_dir, width, height, jobs, pipe, hwaccel, use_async, concat):
+    found = _iter_video_files(folder, recursive)
+
+    if prompt:
+        # Prompting is interactive, so answer for every file up front before
+        # any workers are started.
+        accepted = []
+        for video_file in found:
             response = input(f"Process {video_file}? (y/n/a) ").strip().lower()
             if response == 'n':
-                return
+                continue
             elif response == 'a':
                 print("Process aborted.")
                 sys.exit()
+            accepted.append(video_file)
+        found = iter(accepted)
 
-        if not silent and info:
-            print(f"Processing: {video_file}")
-        
-        if same_dir:
-            output_dir = os.path.dirname(video_file)
+    # Split the available cores between the workers so concurrent ffmpeg
+    # processes do not oversubscribe the CPU.
+    threads = max(1, (os.cpu_count() or 1) // max(1, jobs))
+    if concat and not pipe:
+        # One ffmpeg session for the whole set; it gets all the cores since
+        # nothing else runs beside it. The session needs the complete list.
+        extract_frames_concat(list(found), frame_count, time_interval, silent, info, [(width, height)], os.cpu_count() or 1, same_dir, hwaccel)
+    elif use_async and not pipe:
+        import asyncio
+        asyncio.run(process_folder_async(list(found), silent, info, frame_count, time_interval, same_dir, width, height, threads, jobs, hwaccel))
+    elif recursive and not pipe:
+        # Recursive scans cover many files, so batch them into multi-input
+        # ffmpeg invocations; with -J each full chunk goes to the worker
+        # pool as soon as the walk has produced it.
+        if jobs > 1:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+                futures = []
+                chunk = []
+                for video_file in found:
+                    chunk.append(video_file)
+                    if len(chunk) == BATCH_CHUNK:
+                        futures.append(executor.submit(extract_frames_batch, chunk, frame_count, time_interval, silent, info, [(width, height)], threads, same_dir, hwaccel))
+                        chunk = []
+                if chunk:
+                    futures.append(executor.submit(extract_frames_batch, chunk, frame_count, time_interval, silent, info, [(width, height)], threads, same_dir, hwaccel))
+                for future in futures:
+                    future.result()
         else:
-            base_name = os.path.splitext(os.path.basename(video_file))[0]
-            output_dir = os.path.join(os.path.dirname(video_file), base_name + '_frames')
-            counter = 1
-            unique_folder_name = output_dir
-            while os.path.exists(unique_folder_name):
-                unique_folder_name = f"{output_dir}_{counter}"
-                counter += 1
-            output_dir = unique_folder_name
-        
-        extract_frames(video_file, output_dir, frame_count, time_interval, silent, info, width, height)
+            extract_frames_batch(list(found), frame_count, time_interval, silent, info, [(width, height)], threads, same_dir, hwaccel)
+    elif jobs > 1:
+        # Submit while still scanning, so the first ffmpeg can run during
+        # directory enumeration.
+        with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = [executor.submit(process_file, video_file, silent, info, frame_count, time_interval, same_dir, width, height, threads, pipe, hwaccel) for video_file in found]
+            for future in futures:
+                future.result()
+    else:
+        for video_file in found:
+            process_file(video_file, silent, info, frame_count, time_interval, same_dir, width, height, threads, pipe, hwaccel)
+
+def _output_dir_for(video_file, same_dir):
+    if same_dir:
+        # Bare filenames (e.g. from a --batch list) have no dirname; treat
+        # them as living in the current directory.
+        return os.path.dirname(video_file) or '.'
+
+    base_name = os.path.splitext(os.path.basename(video_file))[0]
+    folder_name = base_name + '_frames'
+    # One directory listing instead of one exists() syscall per name
+    # already taken by an earlier run.
+    with os.scandir(os.path.dirname(video_file) or '.') as entries:
+        taken = {entry.name for entry in entries if entry.name.startswith(folder_name)}
+    if folder_name in taken:
+        suffix_re = re.compile(re.escape(folder_name) + r'_(\d+)$')
+        counter = max((int(match.group(1)) for match in map(suffix_re.fullmatch, taken) if match), default=0) + 1
+        candidate = f"{folder_name}_{counter}"
+    else:
+        counter = 0
+        candidate = folder_name
+    while True:
+        output_dir = os.path.join(os.path.dirname(video_file), candidate)
+        try:
+            # Creating the directory reserves the name atomically, so
+            # concurrent workers handling same-basename videos (a.mp4 and
+            # a.mkv) cannot end up writing into the same folder.
+            os.makedirs(output_dir, exist_ok=False)
+            return output_dir
+        except FileExistsError:
+            counter += 1
+            candidate = f"{folder_name}_{counter}"
+
+def process_file(video_file, silent, info, frame_count, time_interval, same_dir, width, height, threads, pipe, hwaccel):
+    if not silent and info:
+        print(f"Processing: {video_file}")
+
+    output_dir = _output_dir_for(video_file, same_dir)
+
+    if pipe:
+        extract_frames_pipe(video_file, output_dir, frame_count, time_interval, silent, info, [(width, height)], threads)
+    else:
+        extract_frames(video_file, output_dir, frame_count, time_interval, silent, info, [(width, height)], threads, hwaccel)
 
 def main():
     parser = argparse.ArgumentParser(add_help=False)
@@ -153,12 +663,18 @@ def main():
     parser.add_argument('-T', type=int, default=0)
     parser.add_argument('-X', type=int, default=0)
     parser.add_argument('-Y', type=int, default=0)
+    parser.add_argument('-A', action='store_true')
+    parser.add_argument('-C', action='store_true')
+    parser.add_argument('-G', action='store_true')
+    parser.add_argument('-J', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('-M', action='store_true')
     parser.add_argument('-P', action='store_true')
     parser.add_argument('-D', action='store_true')
     parser.add_argument('-H', action='store_true', dest='help')
     parser.add_argument('-?', action='store_true', dest='help')
-    
-    args = parser.parse_args()
+    parser.add_argument('--batch', action='store_true')
+
+    args = parser.parse_intermixed_args()
 
     check_ffmpeg()  # Check if ffmpeg is available on the system path
     
@@ -174,7 +690,18 @@ def main():
         print("Error: The switches -N and -T require an integer value.")
         return
     
-    process_folder(args.source, args.R, args.S, args.I, args.N, args.T, args.P, args.D, args.X, args.Y)
+    hwaccel = _detect_hwaccel() if args.G else ''
+
+    if args.batch:
+        # One interpreter for the whole list, so Python startup is paid once
+        # instead of once per file in a shell loop.
+        for line in sys.stdin:
+            video_file = line.strip()
+            if video_file:
+                process_file(video_file, args.S, args.I, args.N, args.T, args.D, args.X, args.Y, os.cpu_count() or 1, args.M, hwaccel)
+        return
+
+    process_folder(args.source, args.R, args.S, args.I, args.N, args.T, args.P, args.D, args.X, args.Y, max(1, args.J), args.M, hwaccel, args.A, args.C)
 
 if __name__ == "__main__":
     main()